@@ -1,6 +1,10 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import pyarrow as pa
+from pyarrow import csv as pacsv
+import csv
+import io
+import re
 import sys  # added
 
 # ========== 1. CONFIGURATION ==========
@@ -11,60 +15,195 @@ DATA_FILE = "student-mat-messy.csv"
 # Set this to True if you want to show plots
 SHOW_PLOTS = True  # you can change to True
 
+# Only import matplotlib when plots are actually drawn
+if SHOW_PLOTS:
+    import matplotlib.pyplot as plt
+
+# Set this to False to leave the df.info() summary out of the report
+SHOW_INFO = True
+
+# Column types for the UCI student schema (same for student-mat and student-por)
+# Categorical fields are read as dictionary (category) columns and numeric fields as float64,
+# so out-of-range values like "200" or "12.5" load and get flagged in section 5.
+# A numeric column holding non-numeric text (e.g. "abc") is re-read as text and parsed leniently;
+# the text values are reported as invalid in section 5, not as missing.
+CATEGORICAL_COLS = [
+    "school", "sex", "address", "famsize", "Pstatus", "Mjob", "Fjob", "reason",
+    "guardian", "schoolsup", "famsup", "paid", "activities", "nursery", "higher",
+    "internet", "romantic",
+]
+NUMERIC_COLS = [
+    "age", "Medu", "Fedu", "traveltime", "studytime", "failures", "famrel", "freetime",
+    "goout", "Dalc", "Walc", "health", "absences", "G1", "G2", "G3",
+]
+COLUMN_TYPES = {col: pa.dictionary(pa.int32(), pa.string()) for col in CATEGORICAL_COLS}
+COLUMN_TYPES.update({col: pa.float64() for col in NUMERIC_COLS})
+
+# A plain decimal number, used when parsing numeric columns that were re-read as text
+NUMBER_PATTERN = r"[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?"
+
+# Values treated as missing while parsing: pandas' default read_csv markers plus "?"
+NULL_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null", "?",
+]
+
 # Redirect all print output to a file
 output_file = open("analysis_output.txt", "w")
 sys.stdout = output_file
 
 
+def category_counts(series):
+    """Count each observed category of a categorical column with np.bincount on its integer codes.
+
+    Missing values (code -1) are kept as a NaN entry, like value_counts(dropna=False).
+    """
+    codes = series.cat.codes.to_numpy()
+    # Shift codes by one so slot 0 holds the missing values
+    counts = np.bincount(codes + 1, minlength=len(series.cat.categories) + 1)
+    index = pd.Index([np.nan]).append(series.cat.categories).rename(series.name)
+    counts = pd.Series(counts, index=index, name="count")
+    # Like observed=True: leave out categories that never occur in the data
+    counts = counts[counts > 0]
+    return counts.sort_values(ascending=False, kind="stable")
+
+
+def category_percent(counts):
+    """Percentage of each category from category_counts(), without the missing-value entry."""
+    observed = counts[counts.index.notna()]
+    return (observed / observed.sum() * 100).rename("proportion")
+
+
+def count_duplicate_rows(frame):
+    """Count rows that repeat an earlier row, using one vectorized hash per row."""
+    row_hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return len(row_hashes) - np.unique(row_hashes).size
+
+
+def read_student_csv(path, parse_options):
+    """Read the CSV with COLUMN_TYPES.
+
+    A numeric column that holds non-numeric text makes the typed read fail; that column is
+    switched to text and the read is retried. Returns the frame and the names of those columns.
+    """
+    with open(path, newline="") as f:
+        header = next(csv.reader(f, delimiter=parse_options.delimiter))
+    column_types = dict(COLUMN_TYPES)
+    text_cols = []
+    while True:
+        convert_options = pacsv.ConvertOptions(
+            column_types=column_types,
+            strings_can_be_null=True,
+            null_values=NULL_VALUES,
+        )
+        try:
+            table = pacsv.read_csv(path, parse_options=parse_options, convert_options=convert_options)
+        except pa.ArrowInvalid as err:
+            match = re.match(r"In CSV column #(\d+)", str(err))
+            col = header[int(match.group(1))] if match else None
+            if col not in NUMERIC_COLS or col in text_cols:
+                raise
+            column_types[col] = pa.string()
+            text_cols.append(col)
+            continue
+        return table.to_pandas(types_mapper=arrow_to_pandas_dtype), text_cols
+
+
+def parse_numeric_text(series):
+    """Parse a text column as numbers.
+
+    Values that aren't numbers become missing in the parsed column and are returned separately,
+    so they can be reported as invalid instead of missing.
+    """
+    text = series.str.strip()
+    is_number = text.str.fullmatch(NUMBER_PATTERN).fillna(False)
+    invalid = series[text.notna() & ~is_number]
+    return text.where(is_number).astype("double[pyarrow]"), invalid
+
+
+def arrow_to_pandas_dtype(arrow_type):
+    """Keep Arrow columns as Arrow-backed dtypes, except dictionary columns which become category."""
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
+def draw_overview_plots(df, num_cols, cat_counts):
+    """Save histograms of the grades and bar charts of a few categorical columns."""
+    # Example: focus on a few important ones
+    cols_to_plot = [c for c in ["G1", "G2", "G3"] if c in num_cols]
+
+    for col in cols_to_plot:
+        fig, ax = plt.subplots()
+        df[col].hist(bins=15, ax=ax)
+        ax.set_title(f"Histogram of {col}")
+        ax.set_xlabel(col)
+        ax.set_ylabel("Number of students")
+        fig.tight_layout()
+        # changed here
+        fig.savefig(f"{col}_hist.png")
+        plt.close(fig)
+
+    # Choose some important categorical columns
+    for col in ["school", "sex", "internet", "guardian"]:
+        if col in cat_counts:
+            fig, ax = plt.subplots()
+            cat_counts[col].plot(kind="bar", ax=ax)
+            ax.set_title(f"Distribution of {col}")
+            ax.set_xlabel(col)
+            ax.set_ylabel("Count")
+            fig.tight_layout()
+            # changed here
+            fig.savefig(f"{col}_bar.png")
+            plt.close(fig)
+
+
 # ========== 2. LOAD DATA ==========
 
 print("=== Loading dataset ===")
-df = pd.read_csv(DATA_FILE, sep=";")  # UCI uses semicolon in some versions; change sep=";" if needed
+# Read with a fixed schema so nothing has to be inferred
+parse_options = pacsv.ParseOptions(delimiter=";")  # UCI uses semicolon in some versions
+df, text_cols = read_student_csv(DATA_FILE, parse_options)
+# Non-numeric text found in numeric columns, kept for the validity checks
+invalid_values = {}
+for col in text_cols:
+    df[col], invalid_values[col] = parse_numeric_text(df[col])
+invalid_counts = pd.Series({col: len(v) for col, v in invalid_values.items()}, dtype=int)
+
+# Downcast the numeric fields to the narrowest integer type that fits
+# (values that don't fit, like 12.5, keep the column as float)
+for col in [c for c in NUMERIC_COLS if c in df.columns]:
+    df[col] = pd.to_numeric(df[col], downcast="integer" if col == "absences" else "unsigned")
+
+# Work out the numeric and categorical columns once; every section below reuses these lists
+num_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+cat_cols = df.select_dtypes(include=["object", "category", "string"]).columns.tolist()
+
+# Convert categorical columns to category once; the counts are reused by the plots and sections 4 and 6
+df[cat_cols] = df[cat_cols].astype("category")
+cat_counts = {col: category_counts(df[col]) for col in cat_cols}
+
 print(f"Loaded {len(df)} rows and {df.shape[1]} columns from {DATA_FILE}\n")
 
 print("=== First 5 rows ===")
 print(df.head(), "\n")
 
-print("=== Info ===")
-print(df.info(), "\n")
+if SHOW_INFO:
+    print("=== Info ===")
+    # df.info() prints itself and returns None, so write it to a buffer first
+    # memory_usage=False skips the per-column memory walk
+    info_buf = io.StringIO()
+    df.info(buf=info_buf, memory_usage=False)
+    print(info_buf.getvalue(), "\n")
 
 if SHOW_PLOTS:
-    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-
-    # Example: focus on a few important ones
-    cols_to_plot = [c for c in ["G1", "G2", "G3"] if c in numeric_cols]
-
-    for col in cols_to_plot:
-        plt.figure()
-        df[col].hist(bins=15)
-        plt.title(f"Histogram of {col}")
-        plt.xlabel(col)
-        plt.ylabel("Number of students")
-        plt.tight_layout()
-        # changed here
-        plt.savefig(f"{col}_hist.png")
-        plt.close()
-
-if SHOW_PLOTS:
-    cat_cols = df.select_dtypes(include="object").columns.tolist()
-
-    # Choose some important categorical columns
-    for col in ["school", "sex", "internet", "guardian"]:
-        if col in df.columns:
-            plt.figure()
-            df[col].value_counts(dropna=False).plot(kind="bar")
-            plt.title(f"Distribution of {col}")
-            plt.xlabel(col)
-            plt.ylabel("Count")
-            plt.tight_layout()
-            # changed here
-            plt.savefig(f"{col}_bar.png")
-            plt.close()
+    draw_overview_plots(df, num_cols, cat_counts)
 
 # ========== 3. COMPLETENESS CHECK (MISSING VALUES) ==========
 
 print("=== Missing Values (Completeness) ===")
-missing_counts = df.isna().sum()
+# Non-numeric text is also NaN after parsing, but it was there in the file, so leave it out here
+missing_counts = df.isna().sum() - invalid_counts.reindex(df.columns, fill_value=0)
 missing_percent = (missing_counts / len(df)) * 100
 
 missing_df = pd.DataFrame({
@@ -79,17 +218,18 @@ print(missing_df, "\n")
 # ========== 4. CONSISTENCY CHECKS (CATEGORICAL VALUES & DUPLICATES) ==========
 
 print("=== Categorical Columns & Unique Values (Consistency) ===")
-cat_cols = df.select_dtypes(include=["object"]).columns.tolist()
 print(f"Categorical columns: {cat_cols}\n")
+print("Number of unique values:")
+print(df[cat_cols].nunique(), "\n")
 
 for col in cat_cols:
     print(f"--- {col} ---")
-    print(df[col].value_counts(dropna=False))
+    print(cat_counts[col])
     print()
 
 # Check duplicates (exact row duplicates)
 print("=== Duplicate Rows Check ===")
-dup_count = df.duplicated().sum()
+dup_count = count_duplicate_rows(df)
 print(f"Number of completely duplicated rows: {dup_count}\n")
 
 # If you want to check potential duplicates based on a subset of columns:
@@ -98,28 +238,36 @@ potential_id_cols = ["school", "sex", "age", "address", "famsize", "Pstatus"]
 existing_id_cols = [c for c in potential_id_cols if c in df.columns]
 
 if existing_id_cols:
-    dup_subset_count = df.duplicated(subset=existing_id_cols).sum()
+    dup_subset_count = count_duplicate_rows(df[existing_id_cols])
     print(f"Possible duplicates based on {existing_id_cols}: {dup_subset_count}\n")
 
 
 # ========== 5. VALIDITY CHECKS (RANGES / OUTLIERS) ==========
 
 print("=== Validity Checks for Numeric Columns ===")
-num_cols = df.select_dtypes(include=[np.number]).columns.tolist()
 print(f"Numeric columns: {num_cols}\n")
 
 print("=== Descriptive Stats ===")
 print(df[num_cols].describe().T, "\n")
 
+# Values in numeric columns that aren't numbers at all (e.g. "abc")
+for col, values in invalid_values.items():
+    print(f"--- {col} non-numeric values ---")
+    print(f"Invalid values: {len(values)}")
+    print(values.value_counts(), "\n")
+
 # Example validity checks for grades (expected 0–20)
 grade_cols = [c for c in ["G1", "G2", "G3"] if c in df.columns]
 
-for g in grade_cols:
-    invalid_low = df[df[g] < 0]
-    invalid_high = df[df[g] > 20]
+# Count out-of-range grades for all grade columns in one pass
+grades = df[grade_cols].to_numpy(dtype=float, na_value=np.nan)
+invalid_low = (grades < 0).sum(axis=0)
+invalid_high = (grades > 20).sum(axis=0)
+
+for i, g in enumerate(grade_cols):
     print(f"--- {g} validity ---")
-    print(f"Values < 0: {len(invalid_low)}")
-    print(f"Values > 20: {len(invalid_high)}\n")
+    print(f"Values < 0: {invalid_low[i]}")
+    print(f"Values > 20: {invalid_high[i]}\n")
 
 # Example validity check for absences (e.g., extremely large values)
 if "absences" in df.columns:
@@ -127,28 +275,28 @@ if "absences" in df.columns:
     print(df["absences"].describe(), "\n")
 
     if SHOW_PLOTS:
-        plt.figure()
-        df["absences"].hist(bins=30)
-        plt.title("Absences Distribution")
-        plt.xlabel("Absences")
-        plt.ylabel("Count")
+        fig, ax = plt.subplots()
+        df["absences"].hist(bins=30, ax=ax)
+        ax.set_title("Absences Distribution")
+        ax.set_xlabel("Absences")
+        ax.set_ylabel("Count")
         # changed here
-        plt.savefig("absences_hist.png")
-        plt.close()
+        fig.savefig("absences_hist.png")
+        plt.close(fig)
 
 # ========== 6. BIAS / SAMPLING ANALYSIS (DATA MINING PERSPECTIVE) ==========
 
 print("=== Sampling / Demographic Bias Checks ===")
 
 # School distribution
-if "school" in df.columns:
+if "school" in cat_counts:
     print("--- School distribution ---")
-    print(df["school"].value_counts(normalize=True) * 100, "\n")
+    print(category_percent(cat_counts["school"]), "\n")
 
 # Sex distribution
-if "sex" in df.columns:
+if "sex" in cat_counts:
     print("--- Sex distribution ---")
-    print(df["sex"].value_counts(normalize=True) * 100, "\n")
+    print(category_percent(cat_counts["sex"]), "\n")
 
 # Age distribution
 if "age" in df.columns:
@@ -156,14 +304,14 @@ if "age" in df.columns:
     print(df["age"].value_counts().sort_index(), "\n")
 
     if SHOW_PLOTS:
-        plt.figure()
-        df["age"].hist(bins=range(df["age"].min(), df["age"].max() + 1))
-        plt.title("Age Distribution")
-        plt.xlabel("Age")
-        plt.ylabel("Count")
+        fig, ax = plt.subplots()
+        df["age"].hist(bins=range(int(df["age"].min()), int(df["age"].max()) + 1), ax=ax)
+        ax.set_title("Age Distribution")
+        ax.set_xlabel("Age")
+        ax.set_ylabel("Count")
         # changed here
-        plt.savefig("age_hist.png")
-        plt.close()
+        fig.savefig("age_hist.png")
+        plt.close(fig)
 
 # Parent education (socioeconomic bias proxy)
 parent_edu_cols = [c for c in ["Medu", "Fedu"] if c in df.columns]
@@ -172,11 +320,15 @@ for col in parent_edu_cols:
     print(df[col].value_counts(normalize=True).sort_index() * 100, "\n")
 
 # If you want to define a pass/fail label to inspect class imbalance:
-if set(grade_cols):
+if grade_cols:
     target = grade_cols[-1]  # use final grade (G3) if available
     print(f"=== Pass/Fail label based on {target} >= 10 ===")
-    df["pass_fail"] = (df[target] >= 10).astype(int)
-    print(df["pass_fail"].value_counts(normalize=True) * 100, "\n")
+    # Count passes straight from the grade array instead of adding a pass_fail column
+    target_grades = df[target].dropna().to_numpy()
+    n_pass = np.count_nonzero(target_grades >= 10)
+    n_fail = target_grades.size - n_pass
+    pass_fail = pd.Series({True: n_pass, False: n_fail}, name="proportion").rename_axis("pass_fail")
+    print((pass_fail / target_grades.size * 100).sort_values(ascending=False), "\n")
 
 
 
@@ -184,7 +336,18 @@ if set(grade_cols):
 
 if grade_cols:
     print("=== Correlation with final grade (Feature Quality) ===")
-    corr_with_G3 = df[num_cols].corr()[grade_cols[-1]].sort_values(ascending=False)
+    # Only the final-grade column is needed, so compute it directly instead of the full corr() matrix.
+    # Rows where either value is missing are left out per column, like corr() does.
+    X = df[num_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = X[:, num_cols.index(grade_cols[-1])]
+    valid = ~np.isnan(X) & ~np.isnan(y)[:, None]
+    n_valid = valid.sum(axis=0)
+    Xc = np.where(valid, X, 0.0)
+    yc = np.where(valid, y[:, None], 0.0)
+    Xc = np.where(valid, Xc - Xc.sum(axis=0) / n_valid, 0.0)
+    yc = np.where(valid, yc - yc.sum(axis=0) / n_valid, 0.0)
+    corr = (Xc * yc).sum(axis=0) / np.sqrt((Xc ** 2).sum(axis=0) * (yc ** 2).sum(axis=0))
+    corr_with_G3 = pd.Series(corr, index=num_cols, name=grade_cols[-1]).sort_values(ascending=False)
     print(corr_with_G3, "\n")
 
 